@@ -22,15 +22,25 @@ class CustomUserAdmin(UserAdmin):
 class TeamAdmin(admin.ModelAdmin):
     list_display = ('name', 'country', 'matches_played', 'wins', 'lost', 'draw', 'points')
     search_fields = ('name', 'country')
+    raw_id_fields = ('captain',)
 
 # Register PlayerProfile model
 @admin.register(PlayerProfile)
 class PlayerProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'age', 'type', 'team', 'matches_played', 'total_runs', 'wickets', 'is_playing')
     list_filter = ('type', 'team', 'is_playing')
+    list_select_related = ('user', 'team')
+    raw_id_fields = ('user', 'team')
+    list_per_page = 50
+    show_full_result_count = False
 
 # Register Match model
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     list_display = ('team1', 'team2', 'venue', 'date', 'winner')
     list_filter = ('venue', 'date')
+    list_select_related = ('team1', 'team2', 'winner')
+    raw_id_fields = ('team1', 'team2', 'winner')
+    list_per_page = 50
+    show_full_result_count = False
+
@@ -0,0 +1,66 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser
+
+# Seconds a verified access token is reused before being verified again
+VALIDATED_TOKEN_TTL = 30
+
+# Seconds an authenticated user is served without a database lookup. The
+# default cache is per process and the receivers below only evict in the
+# process that saved the change, so other workers may keep serving a demoted
+# or deactivated user's old role for up to this long. Keep it short unless
+# CACHES points at a shared backend.
+CACHED_USER_TTL = 5
+
+def user_cache_key(user_id):
+    return f"jwt-user:{user_id}"
+
+def forget_user(user_id):
+    """Drop a cached user so the next request reloads their role from the database."""
+    if user_id is not None:
+        cache.delete(user_cache_key(user_id))
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers recently verified access tokens, so repeat
+    requests with the same token skip signature and claims verification, and
+    recently authenticated users, so they skip the per-request user SELECT for
+    up to CACHED_USER_TTL seconds. Invalid tokens and unknown or inactive users
+    raise before anything is cached.
+    """
+
+    def get_validated_token(self, raw_token):
+        key = f"jwt:{hashlib.sha256(raw_token).hexdigest()[:32]}"
+        validated_token = cache.get(key)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            # Never keep a token around past its own expiry
+            expires_at = validated_token.get('exp')
+            ttl = VALIDATED_TOKEN_TTL
+            if expires_at is not None:
+                ttl = min(ttl, int(expires_at - time.time()))
+            if ttl > 0:
+                cache.set(key, validated_token, ttl)
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, CACHED_USER_TTL)
+        return user
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def forget_changed_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
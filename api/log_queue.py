@@ -0,0 +1,76 @@
+"""
+Hands log records to a background thread, so writing to disk/stderr never
+blocks a request.
+
+settings.LOGGING routes the root logger to a ProcessQueueHandler on LOG_QUEUE
+and attaches the real handlers to the non-propagating SINK_LOGGER. The first
+record a process logs starts a listener that drains the queue into those
+handlers. A forked child (gunicorn --preload workers, test --parallel) gets a
+fresh queue and starts its own listener, since the parent's thread does not
+survive the fork.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_QUEUE = queue.SimpleQueue()
+
+# Logger whose handlers do the actual writing; nothing logs to it directly
+SINK_LOGGER = 'api.log_sink'
+
+_listener = None
+_listener_lock = threading.Lock()
+_queue_handlers = weakref.WeakSet()
+
+class ProcessQueueHandler(QueueHandler):
+    """QueueHandler that makes sure the current process has a listener running."""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        _queue_handlers.add(self)
+
+    def handle(self, record):
+        # Checked before the handler lock is taken, so starting the listener
+        # never runs while this handler is locked. Without a listener nothing
+        # would drain the queue, so the record is dropped instead.
+        if _listener is None and not start_listener():
+            return False
+        return super().handle(record)
+
+def start_listener():
+    """Start this process's listener if needed; return whether one is running."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            handlers = logging.getLogger(SINK_LOGGER).handlers
+            if not handlers:
+                return False
+            _listener = QueueListener(LOG_QUEUE, *handlers, respect_handler_level=True)
+            _listener.start()
+    return True
+
+def stop_listener():
+    """Flush whatever is still queued and stop this process's listener."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+def _reset_after_fork():
+    # Only the forking thread exists in the child: the listener is gone, and
+    # the queue and lock may have been mid-use, so start over with new ones
+    global LOG_QUEUE, _listener, _listener_lock
+    LOG_QUEUE = queue.SimpleQueue()
+    _listener = None
+    _listener_lock = threading.Lock()
+    for handler in _queue_handlers:
+        handler.queue = LOG_QUEUE
+
+atexit.register(stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
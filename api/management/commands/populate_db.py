@@ -1,6 +1,8 @@
 import random
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from api.models import CustomUser, Team, PlayerProfile, Match
 from faker import Faker
 from django.utils import timezone
@@ -8,12 +10,20 @@ from datetime import timedelta
 
 User = get_user_model()
 
+BATCH_SIZE = 500
+
 class Command(BaseCommand):
     help = 'Populate database with fake data'
 
     def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            self._populate()
+
+    def _populate(self):
         fake = Faker()
-        
+        # Hash the shared password once instead of once per user
+        hashed_password = make_password('password123')
+
         # Create admin user
         admin_user = CustomUser.objects.create_superuser(
             username='admin',
@@ -35,84 +45,82 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Created teams'))
 
         # Create 5 organiser users
-        for i in range(5):
-            CustomUser.objects.create_user(
-                username=f'org_{fake.user_name()}',
-                password='password123',
-                email=fake.email(),
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                username=f'org_{fake.unique.user_name()}',
+                password=hashed_password,
+                email=fake.unique.email(),
                 category='ORGANISER'
             )
+            for i in range(5)
+        ], batch_size=BATCH_SIZE)
         self.stdout.write(self.style.SUCCESS('Created organiser users'))
 
         # Create captains (1 per team)
-        captains = []
-        for i in range(5):
-            captain_user = CustomUser.objects.create_user(
-                username=f'captain_{fake.user_name()}',
-                password='password123',
-                email=fake.email(),
+        captain_usernames = [f'captain_{fake.unique.user_name()}' for i in range(5)]
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                username=username,
+                password=hashed_password,
+                email=fake.unique.email(),
                 category='CAPTAIN'
             )
-            captains.append(captain_user)
-            
+            for username in captain_usernames
+        ], batch_size=BATCH_SIZE)
+        # Refetch so primary keys are available on every backend
+        captains_by_username = CustomUser.objects.in_bulk(captain_usernames, field_name='username')
+        captains = [captains_by_username[username] for username in captain_usernames]
+
+        profiles = []
+        for team, captain_user in zip(teams, captains):
             # Associate captain with team
-            team = teams[i]
             team.captain = captain_user
-            team.save()
-            
+
             # Create captain's player profile
-            PlayerProfile.objects.create(
+            profiles.append(PlayerProfile(
                 user=captain_user,
                 age=random.randint(24, 35),
                 type='BATTER',  # Captains are batters
                 team=team,
                 is_playing=True  # Captain is always in playing XI
                 # Let matches update the statistics
-            )
+            ))
+        # Assign all captains in one statement
+        Team.objects.bulk_update(teams, ['captain'])
         self.stdout.write(self.style.SUCCESS('Created captains'))
 
-        # Create players for each team ensuring each team has at least 11 players
+        # Create players for each team ensuring each team has at least 11 players.
+        # Each entry is (team, is_playing); the captain already fills one XI slot.
+        player_slots = []
         for team in teams:
-            # Calculate how many players we need to add to this team
-            # Since captain is already on the team and is_playing=True
-            current_players = team.players.filter(is_playing=True).count()
-            players_needed = max(0, 11 - current_players)
-            
-            # Add required number of players to the team
-            for _ in range(players_needed):
-                player_user = CustomUser.objects.create_user(
-                    username=fake.user_name(),
-                    password='password123',
-                    email=fake.email(),
-                    category='PLAYER'
-                )
-                
-                PlayerProfile.objects.create(
-                    user=player_user,
-                    age=random.randint(18, 35),
-                    type=random.choice(['BATTER', 'BOWLER', 'ALL_ROUNDER', 'WICKET_KEEPER']),
-                    team=team,
-                    is_playing=True  # These players are in playing XI
-                    # Let matches update the statistics
-                )
-            
+            player_slots += [(team, True)] * 10
             # Add some additional players who aren't in the playing XI
-            for _ in range(random.randint(3, 7)):
-                player_user = CustomUser.objects.create_user(
-                    username=fake.user_name(),
-                    password='password123',
-                    email=fake.email(),
-                    category='PLAYER'
-                )
-                
-                PlayerProfile.objects.create(
-                    user=player_user,
-                    age=random.randint(18, 35),
-                    type=random.choice(['BATTER', 'BOWLER', 'ALL_ROUNDER', 'WICKET_KEEPER']),
-                    team=team,
-                    is_playing=False  # These players are not in playing XI
-                    # Let matches update the statistics
-                )
+            player_slots += [(team, False)] * random.randint(3, 7)
+
+        player_usernames = [fake.unique.user_name() for _ in player_slots]
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                username=username,
+                password=hashed_password,
+                email=fake.unique.email(),
+                category='PLAYER'
+            )
+            for username in player_usernames
+        ], batch_size=BATCH_SIZE)
+        players_by_username = CustomUser.objects.in_bulk(player_usernames, field_name='username')
+
+        # bulk_create skips full_clean(), so only offer the model's own types
+        player_types = sorted(PlayerProfile.PLAYER_TYPE_KEYS)
+        for username, (team, is_playing) in zip(player_usernames, player_slots):
+            profiles.append(PlayerProfile(
+                user=players_by_username[username],
+                age=random.randint(18, 35),
+                type=random.choice(player_types),
+                team=team,
+                is_playing=is_playing
+                # Let matches update the statistics
+            ))
+        PlayerProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
         self.stdout.write(self.style.SUCCESS('Created players'))
 
         # Create match history in chronological order
@@ -141,19 +149,16 @@ class Command(BaseCommand):
             
             # Randomly update player statistics for this match
             # Only do this for players who were playing in this match
-            for player in team1.players.filter(is_playing=True):
-                if player.type in ['BATTER', 'ALL_ROUNDER', 'WICKET_KEEPER']:
-                    player.total_runs += random.randint(0, 50)
-                if player.type in ['BOWLER', 'ALL_ROUNDER']:
-                    player.wickets += random.randint(0, 3)
-                player.save()
-            
-            for player in team2.players.filter(is_playing=True):
-                if player.type in ['BATTER', 'ALL_ROUNDER', 'WICKET_KEEPER']:
+            players = list(
+                PlayerProfile.objects.filter(team__in=[team1, team2], is_playing=True)
+                .only('id', 'type', 'total_runs', 'wickets')
+            )
+            for player in players:
+                if player.type in ['BATTER', 'ALL_ROUNDER']:
                     player.total_runs += random.randint(0, 50)
                 if player.type in ['BOWLER', 'ALL_ROUNDER']:
                     player.wickets += random.randint(0, 3)
-                player.save()
+            PlayerProfile.objects.bulk_update(players, ['total_runs', 'wickets'], batch_size=BATCH_SIZE)
 
         self.stdout.write(self.style.SUCCESS('Created matches and updated player statistics'))
         
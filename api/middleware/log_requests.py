@@ -3,31 +3,69 @@ import json
 
 logger = logging.getLogger('django.request')
 
+# Request bodies larger than this are never read for logging
+MAX_LOGGED_BODY_SIZE = 8192
+
+# Requests that are not worth logging
+SKIPPED_PATH_PREFIXES = ('/static/', '/media/')
+SKIPPED_PATHS = frozenset(('/favicon.ico', '/healthz', '/readyz'))
+
 class APILoggingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        # Clone request body (as it can only be read once)
+        # Skip all logging work for static/health-check paths, or when INFO
+        # records would be dropped anyway
+        path = request.path
+        if (
+            not logger.isEnabledFor(logging.INFO)
+            or path.startswith(SKIPPED_PATH_PREFIXES)
+            or path in SKIPPED_PATHS
+        ):
+            return self.get_response(request)
+        logger_info = logger.info
+
+        # Clone request body (as it can only be read once). Accessing
+        # request.body buffers the whole upload, so check the declared size
+        # first and never touch multipart bodies.
         body = ''
         if request.method in ['POST', 'PUT', 'PATCH']:
             try:
-                body = request.body.decode('utf-8')
-                body = json.loads(body) if body else {}
-            except (ValueError, Exception):
-                body = '[unreadable]'
-
-        # Get user information
-        user = getattr(request, 'user', None)
-        
-        if user and user.is_authenticated:
-            user_info = f"{user.username} ({getattr(user, 'category', 'Unknown')})"
-        else:
-            user_info = "Anonymous"
-
-        # Log request details
-        logger.info(
-            f"[REQUEST] {request.method} {request.path} | User: {user_info} | Body: {body}"
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                content_length = 0
+            if request.content_type.startswith('multipart/'):
+                body = '[multipart omitted]'
+            elif request.content_type != 'application/json':
+                body = f'[{request.content_type or "no content type"}]'
+            elif content_length > MAX_LOGGED_BODY_SIZE:
+                body = '[truncated]'
+            else:
+                try:
+                    body = request.body.decode('utf-8')
+                    body = json.loads(body) if body else {}
+                except (ValueError, Exception):
+                    body = '[unreadable]'
+
+        # Get user information, cached on the request for later middleware
+        user_info = getattr(request, '_cached_user_info', None)
+        if user_info is None:
+            user = getattr(request, 'user', None)
+
+            if user and user.is_authenticated:
+                user_info = f"{user.username} ({getattr(user, 'category', 'Unknown')})"
+            else:
+                user_info = "Anonymous"
+            request._cached_user_info = user_info
+
+        # Log request details; the same fields go in extra so handlers and
+        # tests can read them off the record instead of parsing the message
+        log_fields = {'method': request.method, 'path': path, 'user': user_info}
+        logger_info(
+            "[REQUEST] %s %s | User: %s | Body: %s",
+            request.method, path, user_info, body,
+            extra={**log_fields, 'body': body}
         )
 
         # Process the request
@@ -41,9 +79,10 @@ class APILoggingMiddleware:
             error_type = "Server Error"
 
         # Log response details
-        logger.info(
-            f"[RESPONSE] {request.method} {request.path} | User: {user_info} | "
-            f"Status: {response.status_code} | Error Type: {error_type or 'Success'}\n"
+        logger_info(
+            "[RESPONSE] %s %s | User: %s | Status: %s | Error Type: %s\n",
+            request.method, path, user_info, response.status_code, error_type or 'Success',
+            extra={**log_fields, 'status_code': response.status_code}
         )
 
-        return response
\ No newline at end of file
+        return response
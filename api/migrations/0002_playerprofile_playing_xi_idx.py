@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-15 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playerprofile',
+            index=models.Index(condition=models.Q(('is_playing', True)), fields=['team', 'is_playing'], name='playerprofile_playing_xi_idx'),
+        ),
+    ]
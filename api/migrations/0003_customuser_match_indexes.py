@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-15 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_playerprofile_playing_xi_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['category'], name='api_customu_categor_da8e56_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['date'], name='api_match_date_d59857_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['team1', 'team2'], name='api_match_team1_i_da5ad6_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-15 10:12
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_customuser_match_indexes'),
+    ]
+
+    operations = [
+        # A stored column cannot be altered into a generated one, so it is
+        # recreated; the database computes points for existing rows.
+        migrations.RemoveField(
+            model_name='team',
+            name='points',
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='points',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('wins'), '*', models.Value(2)), '+', models.F('draw')), output_field=models.IntegerField()),
+        ),
+    ]
@@ -1,7 +1,11 @@
+from functools import partial
+
 from django.db import models, transaction
+from django.db.models import Case, F, Q, When
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_delete
 from django.dispatch import receiver
 
 class CustomUser(AbstractUser):
@@ -11,17 +15,33 @@ class CustomUser(AbstractUser):
         ('ADMIN', 'Admin'),
         ('ORGANISER', 'Organiser'),
     )
+    CATEGORY_KEYS = frozenset(category for category, _ in CATEGORY_CHOICES)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='PLAYER')
     email = models.EmailField(unique=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['category']),
+        ]
+
     def clean(self):
-        if self.category not in dict(self.CATEGORY_CHOICES).keys():
+        if self.category not in self.CATEGORY_KEYS:
             raise ValidationError({'category': 'Invalid category.'})
 
     def __str__(self):
         return f"{self.username} ({self.category})"
 
+def _demote_captain(user_id):
+    """Make a former captain a PLAYER again and drop their cached role once that is committed."""
+    # update() sends no post_save, so the cached user has to be evicted here;
+    # after the commit, so a concurrent request cannot re-cache the old role
+    from .authentication import forget_user  # authentication imports this module
+    CustomUser.objects.filter(pk=user_id).update(category='PLAYER')
+    transaction.on_commit(partial(forget_user, user_id))
+
 class Team(models.Model):
+    STAT_FIELDS = ('matches_played', 'wins', 'lost', 'draw', 'points')
+
     name = models.CharField(max_length=100)
     country = models.CharField(max_length=100)
     captain = models.ForeignKey(
@@ -32,34 +52,43 @@ class Team(models.Model):
     wins = models.IntegerField(default=0)
     lost = models.IntegerField(default=0)
     draw = models.IntegerField(default=0)
-    points = models.IntegerField(default=0)
+    # Maintained by the database, so match results never have to write it
+    points = models.GeneratedField(
+        expression=F('wins') * 2 + F('draw'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def update_points(self):
-        """Update team points based on wins and draws."""
-        self.points = (self.wins * 2) + self.draw
-        self.save()
-
     def clean(self):
         if self.captain and self.captain.category != 'CAPTAIN':
             raise ValidationError({'captain': 'Captain must have category CAPTAIN.'})
+        # An unchanged captain was already checked when it was assigned
+        if self.captain_id == getattr(self, '_loaded_captain_id', None):
+            return
         if self.captain:
             existing_team = Team.objects.filter(captain=self.captain).exclude(id=self.id)
             if existing_team.exists():
                 raise ValidationError({'captain': 'This user is already the captain of another team.'})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored captain so clean() can skip re-checking it
+        instance._loaded_captain_id = instance.__dict__.get('captain_id')
+        return instance
+
     def save(self, *args, **kwargs):
         self.full_clean()
-        old_captain = None
-        if self.pk:
-            old_team = Team.objects.get(pk=self.pk)
-            old_captain = old_team.captain
-
+        old_captain_id = getattr(self, '_loaded_captain_id', None)
         super().save(*args, **kwargs)
+        # Mirror the generated column instead of reloading it from the database
+        self.points = self.wins * 2 + self.draw
 
-        if old_captain and old_captain != self.captain:
-            old_captain.category = 'PLAYER'
-            old_captain.save()
+        # A replaced or cleared captain goes back to being a player
+        if old_captain_id and old_captain_id != self.captain_id:
+            _demote_captain(old_captain_id)
+        self._loaded_captain_id = self.captain_id
 
     def __str__(self):
         return self.name
@@ -70,6 +99,7 @@ class PlayerProfile(models.Model):
         ('BOWLER', 'Bowler'),
         ('ALL_ROUNDER', 'All-Rounder'),
     )
+    PLAYER_TYPE_KEYS = frozenset(player_type for player_type, _ in PLAYER_TYPES)
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='player_profile')
     age = models.IntegerField()
     type = models.CharField(max_length=20, choices=PLAYER_TYPES)
@@ -79,15 +109,42 @@ class PlayerProfile(models.Model):
     wickets = models.IntegerField(default=0)
     is_playing = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Serves the playing XI count without scanning benched players
+            models.Index(fields=['team', 'is_playing'], condition=Q(is_playing=True), name='playerprofile_playing_xi_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored XI membership so clean() only counts on a change
+        instance._loaded_is_playing = instance.__dict__.get('is_playing')
+        instance._loaded_team_id = instance.__dict__.get('team_id')
+        return instance
+
     def clean(self):
+        # Not called from save(): bulk/internal writes skip it, and the API
+        # enforces the playing XI limit in PlayerProfileSerializer.validate().
         if self.user.category != 'PLAYER':
             raise ValidationError({'user': 'User must have category PLAYER.'})
-        if self.is_playing and self.team.players.filter(is_playing=True).count() >= 11:
+        joining_xi = self.is_playing and (
+            not getattr(self, '_loaded_is_playing', False)
+            or self.team_id != getattr(self, '_loaded_team_id', None)
+        )
+        if joining_xi and self.playing_teammates(self.team_id, exclude_pk=self.pk).count() >= 11:
             raise ValidationError("A team can only have 11 players in the playing XI.")
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+    @classmethod
+    def playing_teammates(cls, team_id, exclude_pk=None):
+        """
+        Playing players of a team, capped at 11 rows so the XI limit check can
+        stop scanning as soon as the limit is reached.
+        """
+        playing = cls.objects.filter(team_id=team_id, is_playing=True)
+        if exclude_pk is not None:
+            playing = playing.exclude(pk=exclude_pk)
+        return playing.values('pk')[:11]
 
     def __str__(self):
         return f"{self.user.username} ({self.type})"
@@ -99,94 +156,105 @@ class Match(models.Model):
     team2 = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='matches_as_team2')
     winner = models.ForeignKey(Team, null=True, blank=True, on_delete=models.SET_NULL, related_name='matches_won')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['team1', 'team2']),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Save the Match instance, updating team and player stats atomically.
         For new matches: Increment matches_played for teams and playing players, update wins/losses/draws.
         For updates: Revert previous stats, then apply new stats.
         """
-        with transaction.atomic():
+        # No savepoint: when nested (e.g. populate_db, the atomic write views)
+        # a failure here cannot be rolled back on its own. The whole enclosing
+        # transaction is marked for rollback, so a caller that catches the
+        # error must not keep using it. The views roll back on any error anyway.
+        with transaction.atomic(savepoint=False):
             # Determine if this is a new match or an update
             is_new = self.pk is None
-            old_match = None
-            old_winner = None
-            old_team1_players = []
-            old_team2_players = []
+            old_result = None
 
             if not is_new:
-                # Fetch previous state for reversion
-                old_match = Match.objects.select_related('team1', 'team2', 'winner').get(pk=self.pk)
-                old_winner = old_match.winner
-                # Get players who were playing in the previous match
-                old_team1_players = list(old_match.team1.players.filter(is_playing=True))
-                old_team2_players = list(old_match.team2.players.filter(is_playing=True))
+                # Fetch previous result for reversion; only the team ids are needed.
+                # Locking the match row serializes concurrent edits of the same match.
+                old_result = Match.objects.select_for_update().values_list(
+                    'team1_id', 'team2_id', 'winner_id'
+                ).get(pk=self.pk)
 
             # Save the match to get a PK (needed for new matches)
             super().save(*args, **kwargs)
 
             # Revert previous stats if updating
             if not is_new:
-                # Revert matches_played for teams
-                old_match.team1.matches_played = max(0, old_match.team1.matches_played - 1)
-                old_match.team2.matches_played = max(0, old_match.team2.matches_played - 1)
-
-                # Revert matches_played for players
-                for player in old_team1_players + old_team2_players:
-                    player.matches_played = max(0, player.matches_played - 1)
-                    player.save()
-
-                # Revert winner or draw stats
-                if old_winner:
-                    old_winner.wins = max(0, old_winner.wins - 1)
-                    loser = old_match.team2 if old_winner == old_match.team1 else old_match.team1
-                    loser.lost = max(0, loser.lost - 1)
-                    old_winner.update_points()
-                    loser.update_points()
-                    old_winner.save()
-                    loser.save()
-                else:
-                    # Revert draw
-                    old_match.team1.draw = max(0, old_match.team1.draw - 1)
-                    old_match.team2.draw = max(0, old_match.team2.draw - 1)
-                    old_match.team1.update_points()
-                    old_match.team2.update_points()
-                    old_match.team1.save()
-                    old_match.team2.save()
-
-            # Apply new stats
-            # Increment matches_played for teams
-            self.team1.matches_played += 1
-            self.team2.matches_played += 1
-
-            # Increment matches_played for playing players
-            team1_players = self.team1.players.filter(is_playing=True)
-            team2_players = self.team2.players.filter(is_playing=True)
-            for player in team1_players:
-                player.matches_played += 1
-                player.save()
-            for player in team2_players:
-                player.matches_played += 1
-                player.save()
-
-            # Update winner or draw stats
-            if self.winner:
-                self.winner.wins += 1
-                loser = self.team2 if self.winner == self.team1 else self.team1
-                loser.lost += 1
-                self.winner.update_points()
-                loser.update_points()
-                self.winner.save()
-                loser.save()
-            else:
-                # Draw
-                self.team1.draw += 1
-                self.team2.draw += 1
-                self.team1.update_points()
-                self.team2.update_points()
-                self.team1.save()
-                self.team2.save()
-            self.team1.save()
-            self.team2.save()
+                old_team1_id, old_team2_id, _ = old_result
+                self._revert_team_result(*old_result)
+
+                # Revert matches_played for players who were playing, in a
+                # single UPDATE; the matches_played filter keeps it from going negative
+                PlayerProfile.objects.filter(
+                    team_id__in=[old_team1_id, old_team2_id],
+                    is_playing=True,
+                    matches_played__gt=0,
+                ).update(matches_played=F('matches_played') - 1)
+
+            # Apply new stats with F() expressions so each counter bump is
+            # evaluated by the database: one UPDATE for the teams, one for the players
+            self._apply_team_result(self.team1_id, self.team2_id, self.winner_id)
+
+            # Increment matches_played for playing players in a single UPDATE
+            PlayerProfile.objects.filter(
+                team_id__in=[self.team1_id, self.team2_id], is_playing=True
+            ).update(matches_played=F('matches_played') + 1)
+
+        # The counters were updated in SQL, so drop any loaded teams and let the
+        # next access reload them instead of querying on every save
+        self._forget_loaded_teams()
+
+    @staticmethod
+    def _apply_team_result(team1_id, team2_id, winner_id):
+        """Record one played match (win/loss or draw) for both teams in a single UPDATE."""
+        team_ids = {team1_id, team2_id}
+        if winner_id:
+            loser_id = team2_id if winner_id == team1_id else team1_id
+            Team.objects.filter(pk__in=team_ids | {winner_id}).update(
+                matches_played=Case(When(pk__in=team_ids, then=F('matches_played') + 1), default=F('matches_played')),
+                wins=Case(When(pk=winner_id, then=F('wins') + 1), default=F('wins')),
+                lost=Case(When(pk=loser_id, then=F('lost') + 1), default=F('lost')),
+            )
+        else:
+            Team.objects.filter(pk__in=team_ids).update(
+                matches_played=F('matches_played') + 1,
+                draw=F('draw') + 1,
+            )
+
+    @staticmethod
+    def _revert_team_result(team1_id, team2_id, winner_id):
+        """Undo _apply_team_result() in a single UPDATE, never taking a counter below zero."""
+        team_ids = {team1_id, team2_id}
+        if winner_id:
+            loser_id = team2_id if winner_id == team1_id else team1_id
+            Team.objects.filter(pk__in=team_ids | {winner_id}).update(
+                matches_played=Case(
+                    When(pk__in=team_ids, then=Greatest(F('matches_played') - 1, 0)), default=F('matches_played')
+                ),
+                wins=Case(When(pk=winner_id, then=Greatest(F('wins') - 1, 0)), default=F('wins')),
+                lost=Case(When(pk=loser_id, then=Greatest(F('lost') - 1, 0)), default=F('lost')),
+            )
+        else:
+            Team.objects.filter(pk__in=team_ids).update(
+                matches_played=Greatest(F('matches_played') - 1, 0),
+                draw=Greatest(F('draw') - 1, 0),
+            )
+
+    def _forget_loaded_teams(self):
+        """Clear cached team relations whose stats are now stale in memory."""
+        for name in ('team1', 'team2', 'winner'):
+            field = self._meta.get_field(name)
+            if field.is_cached(self):
+                field.delete_cached_value(self)
 
     def __str__(self):
         return f"{self.team1} vs {self.team2} at {self.venue}"
@@ -194,14 +262,5 @@ class Match(models.Model):
 # Signals for captain management
 @receiver(post_delete, sender=Team)
 def revert_captain_on_team_delete(sender, instance, **kwargs):
-    if instance.captain:
-        instance.captain.category = 'PLAYER'
-        instance.captain.save()
-
-@receiver(post_save, sender=Team)
-def ensure_captain_has_team(sender, instance, **kwargs):
-    captains = CustomUser.objects.filter(category='CAPTAIN')
-    for captain in captains:
-        if not Team.objects.filter(captain=captain).exists():
-            captain.category = 'PLAYER'
-            captain.save()
\ No newline at end of file
+    if instance.captain_id:
+        _demote_captain(instance.captain_id)
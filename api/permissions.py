@@ -10,11 +10,14 @@ class RoleEnum(str, Enum):
     PLAYER = "PLAYER"
 
 def role_required(*allowed_roles):
+    # Normalised once at decoration time rather than on every request
+    allowed = frozenset(role.upper() for role in allowed_roles)
+
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(self, request, *args, **kwargs):
             user_role = getattr(request.user, "category", None)
-            if user_role and user_role.upper() in [role.upper() for role in allowed_roles]:
+            if user_role and user_role.upper() in allowed:
                 return view_func(self, request, *args, **kwargs)
             return Response(
                 {"detail": f"Permission denied. Your role '{user_role}' is not in {allowed_roles}."},
@@ -0,0 +1,15 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson handles dicts, lists and str/int subclasses itself; DRF's encoder
+# covers the rest (lazy translation strings, Decimal, UUID, ...)
+_fallback = JSONEncoder().default
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes response bodies with orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_fallback)
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from api.models import Team, PlayerProfile, Match
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
+from django.db import IntegrityError, transaction
 
 CustomUser = get_user_model()
 
@@ -25,10 +26,9 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         }
 
     def validate(self, data):
+        # category is a model ChoiceField, so DRF has already rejected unknown values
         if data['password'] != data['password2']:
             raise serializers.ValidationError({'password': 'Passwords must match.'})
-        if data['category'] not in dict(CustomUser.CATEGORY_CHOICES).keys():
-            raise serializers.ValidationError({'category': 'Invalid category.'})
         return data
 
     def create(self, validated_data):
@@ -55,25 +55,45 @@ class PlayerProfileSerializer(serializers.ModelSerializer):
         ]
 
     def validate_user_id(self, value):
-        try:
-            user = CustomUser.objects.get(id=value)
-            if user.category != 'PLAYER':
-                raise serializers.ValidationError('User must have category PLAYER.')
-            if PlayerProfile.objects.filter(user=user).exists():
-                raise serializers.ValidationError('Player profile already exists for this user.')
-        except CustomUser.DoesNotExist:
+        # Only the category is needed, so skip hydrating the whole user row
+        category = CustomUser.objects.filter(id=value).values_list('category', flat=True).first()
+        if category is None:
             raise serializers.ValidationError('User does not exist.')
+        if category != 'PLAYER':
+            raise serializers.ValidationError('User must have category PLAYER.')
         return value
 
     def validate_type(self, value):
-        if value not in dict(PlayerProfile.PLAYER_TYPES).keys():
+        if value not in PlayerProfile.PLAYER_TYPE_KEYS:
             raise serializers.ValidationError('Invalid player type.')
         return value
 
+    def validate(self, data):
+        # PlayerProfile.save() no longer runs full_clean(), so the playing XI
+        # limit is enforced here where the write is user-initiated.
+        team = data.get('team', getattr(self.instance, 'team', None))
+        is_playing = data.get('is_playing', getattr(self.instance, 'is_playing', False))
+        if is_playing and team is not None:
+            exclude_pk = self.instance.pk if self.instance is not None else None
+            if PlayerProfile.playing_teammates(team.pk, exclude_pk=exclude_pk).count() >= 11:
+                raise serializers.ValidationError(
+                    {NON_FIELD_ERRORS: ['A team can only have 11 players in the playing XI.']}
+                )
+        return data
+
     def create(self, validated_data):
         user_id = validated_data.pop('user').get('id')
-        user = CustomUser.objects.get(id=user_id)
-        return PlayerProfile.objects.create(user=user, **validated_data)
+        # The one-to-one unique constraint rejects a second profile, so there
+        # is no need to look for an existing one beforehand
+        try:
+            with transaction.atomic():
+                return PlayerProfile.objects.create(user_id=user_id, **validated_data)
+        except IntegrityError:
+            # Only a duplicate profile is a client error; anything else (e.g.
+            # a team deleted concurrently) is re-raised
+            if PlayerProfile.objects.filter(user_id=user_id).exists():
+                raise serializers.ValidationError({'user_id': ['Player profile already exists for this user.']})
+            raise
 
 class MatchSerializer(serializers.ModelSerializer):
     team1 = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all())
@@ -96,9 +116,9 @@ class TeamSerializer(serializers.ModelSerializer):
         queryset=CustomUser.objects.filter(category='CAPTAIN'),
         allow_null=True
     )
-    players = serializers.PrimaryKeyRelatedField(
-        many=True, read_only=True, source='players.user'
-    )
+    # Views prefetch 'players' (see TeamView.players_prefetch) so listing
+    # teams reads user ids from the prefetch cache instead of one query per team
+    players = serializers.SerializerMethodField()
 
     class Meta:
         model = Team
@@ -107,6 +127,9 @@ class TeamSerializer(serializers.ModelSerializer):
             'draw', 'points', 'created_at', 'players', 'captain'
         ]
 
+    def get_players(self, obj):
+        return [player.user_id for player in obj.players.all()]
+
     def validate_captain(self, value):
         if value is None:
             return value
@@ -121,30 +144,18 @@ class TeamSerializer(serializers.ModelSerializer):
         team = Team.objects.create(**validated_data)
         # Ensure previous captain (if any) is reverted to PLAYER
         if captain:
-            # Check if another team has this captain
-            other_teams = Team.objects.filter(captain=captain).exclude(id=team.id)
-            for other_team in other_teams:
-                other_team.captain = None
-                other_team.save()
+            # Detach this captain from any other team in a single UPDATE
+            Team.objects.filter(captain=captain).exclude(id=team.id).update(captain=None)
         return team
 
     def update(self, instance, validated_data):
-        old_captain = instance.captain
-        new_captain = validated_data.get('captain', old_captain)
+        new_captain = validated_data.get('captain')
 
-        # Update team
+        # Update team; Team.save() reverts a replaced captain to PLAYER
         instance = super().update(instance, validated_data)
 
-        # Revert old captain to PLAYER if changed
-        if old_captain and old_captain != new_captain:
-            old_captain.category = 'PLAYER'
-            old_captain.save()
-
         # Ensure no other team has this captain
         if new_captain:
-            other_teams = Team.objects.filter(captain=new_captain).exclude(id=instance.id)
-            for other_team in other_teams:
-                other_team.captain = None
-                other_team.save()
+            Team.objects.filter(captain=new_captain).exclude(id=instance.id).update(captain=None)
 
         return instance
\ No newline at end of file
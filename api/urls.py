@@ -1,13 +1,7 @@
+from django.conf import settings
 from django.urls import path
 from .views import PlayerView, TeamView, MatchView, RegisterUserView
 from rest_framework_simplejwt.views import (TokenObtainPairView,TokenRefreshView,)
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(title="Cricket API", default_version='v1'),
-    public=True,
-)
 
 urlpatterns = [
     path('register/', RegisterUserView.as_view(), name='user-register'),
@@ -19,6 +13,18 @@ urlpatterns = [
     path('teams/<int:team_id>/', TeamView.as_view(), name='team-detail'),
     path('matches/', MatchView.as_view(), name='match-list'),
     path('matches/<int:match_id>/', MatchView.as_view(), name='match-detail'),
-    
-    path('swagger/', schema_view.with_ui('swagger'), name='schema-swagger-ui'),
-]
\ No newline at end of file
+]
+
+if settings.ENABLE_SWAGGER:
+    # Imported here so workers without the schema UI never load drf_yasg
+    from drf_yasg.views import get_schema_view
+    from drf_yasg import openapi
+
+    schema_view = get_schema_view(
+        openapi.Info(title="Cricket API", default_version='v1'),
+        public=True,
+    )
+    # The generated schema only changes on deploy, so serve it from the cache
+    urlpatterns.append(
+        path('swagger/', schema_view.with_ui('swagger', cache_timeout=3600), name='schema-swagger-ui')
+    )
\ No newline at end of file
@@ -1,33 +1,38 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from .models import PlayerProfile, Team, Match
 from .serializers import PlayerProfileSerializer, TeamSerializer, MatchSerializer, UserRegisterSerializer, CustomUserSerializer
 from .permissions import RoleEnum, role_required
 from .utils import api_response
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Prefetch
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-class StandardResultsSetPagination(PageNumberPagination):
+class StandardCursorPagination(CursorPagination):
+    # Keyset pagination on the primary key: no COUNT(*) and no OFFSET scan,
+    # so every page costs the same however deep the client reads
+    ordering = 'id'
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
     
 class PlayerView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = StandardCursorPagination
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN, RoleEnum.PLAYER)
     def get(self, request, player_id=None):
         try:
             if player_id:
-                # Fetch the player profile
-                player = PlayerProfile.objects.get(id=player_id)
+                # Fetch the player profile together with its user
+                player = PlayerProfile.objects.select_related('user').get(id=player_id)
                 player_serializer = PlayerProfileSerializer(player)
 
                 # Fetch the associated user
@@ -41,7 +46,7 @@ class PlayerView(APIView):
                 return Response(api_response(data=combined_data))
 
             # Fetch all player profiles
-            players = PlayerProfile.objects.all().order_by('id')
+            players = PlayerProfile.objects.select_related('user')
             paginator = self.pagination_class()
             result_page = paginator.paginate_queryset(players, request)
 
@@ -64,35 +69,42 @@ class PlayerView(APIView):
             return Response(api_response(message="Server error", code=500), status=500)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN)
+    @transaction.atomic
     def post(self, request):
         serializer = PlayerProfileSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except serializers.ValidationError as exc:
+                return Response(api_response(data=exc.detail, message="Validation failed", code=400), status=400)
             return Response(api_response(data=serializer.data, message="Player created", code=201), status=201)
         return Response(api_response(data=serializer.errors, message="Validation failed", code=400), status=400)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN, RoleEnum.PLAYER)
     def put(self, request, player_id):
         try:
-            # Fetch the player profile
-            player = PlayerProfile.objects.get(id=player_id)
-
-            # Check if the user is authorized to update the player profile
-            if (
-                request.user.category not in [RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN]
-                and player.user != request.user
-            ):
-                return Response(api_response(message="Unauthorized", code=403), status=403)
+            # Lock the profile for the rest of the request so the ownership
+            # check below still holds when the update is written
+            with transaction.atomic():
+                player = PlayerProfile.objects.select_for_update().get(id=player_id)
 
-            # Update the player profile
-            serializer = PlayerProfileSerializer(player, data=request.data, partial=True)
-            if serializer.is_valid():
-                try:
-                    serializer.save()
-                except ValidationError as ve:
-                    return Response(api_response(data=ve.message_dict, message="Validation failed", code=400), status=400)
-                return Response(api_response(data=serializer.data, message="Player updated"))
-            return Response(api_response(data=serializer.errors, message="Validation failed", code=400), status=400)
+                # Check if the user is authorized to update the player profile;
+                # comparing ids avoids loading the profile's user
+                if (
+                    request.user.category not in [RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN]
+                    and player.user_id != request.user.pk
+                ):
+                    return Response(api_response(message="Unauthorized", code=403), status=403)
+
+                # Update the player profile
+                serializer = PlayerProfileSerializer(player, data=request.data, partial=True)
+                if serializer.is_valid():
+                    try:
+                        serializer.save()
+                    except ValidationError as ve:
+                        return Response(api_response(data=ve.message_dict, message="Validation failed", code=400), status=400)
+                    return Response(api_response(data=serializer.data, message="Player updated"))
+                return Response(api_response(data=serializer.errors, message="Validation failed", code=400), status=400)
 
         except PlayerProfile.DoesNotExist:
             return Response(api_response(message="Player not found", code=404), status=404)
@@ -101,31 +113,40 @@ class PlayerView(APIView):
             return Response(api_response(message="Server error", code=500), status=500)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN)
+    @transaction.atomic
     def delete(self, request, player_id):
         try:
-            player = PlayerProfile.objects.get(id=player_id)
-            if player.user != request.user and request.user.category != RoleEnum.ADMIN:
+            # The ownership check is part of the DELETE itself; the row is only
+            # looked up again to tell 'not yours' from 'not found'
+            players = PlayerProfile.objects.filter(id=player_id)
+            if request.user.category != RoleEnum.ADMIN:
+                players = players.filter(user_id=request.user.pk)
+            deleted, _ = players.delete()
+            if deleted:
+                return Response(api_response(message="Player deleted"))
+            if PlayerProfile.objects.filter(id=player_id).exists():
                 return Response(api_response(message="Unauthorized", code=403), status=403)
-            player.delete()
-            return Response(api_response(message="Player deleted"))
-        except PlayerProfile.DoesNotExist:
             return Response(api_response(message="Player not found", code=404), status=404)
         except Exception:
             logger.exception("Error deleting player")
+            # The 500 is a normal response, so roll back explicitly
+            transaction.set_rollback(True)
             return Response(api_response(message="Server error", code=500), status=500)
 
 class TeamView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = StandardCursorPagination
+    # TeamSerializer.players only needs each profile's user_id
+    players_prefetch = Prefetch('players', queryset=PlayerProfile.objects.only('id', 'user_id', 'team_id'))
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER, RoleEnum.CAPTAIN)
     def get(self, request, team_id=None):
         try:
             if team_id:
-                team = Team.objects.get(id=team_id)
+                team = Team.objects.prefetch_related(self.players_prefetch).get(id=team_id)
                 serializer = TeamSerializer(team)
                 return Response(api_response(data=serializer.data))
-            teams = Team.objects.all().order_by('id')  # Add ordering
+            teams = Team.objects.prefetch_related(self.players_prefetch)
             paginator = self.pagination_class()
             result_page = paginator.paginate_queryset(teams, request)
             serializer = TeamSerializer(result_page, many=True)
@@ -137,6 +158,7 @@ class TeamView(APIView):
             return Response(api_response(message="Server error", code=500), status=500)
         
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
+    @transaction.atomic
     def post(self, request):
         serializer = TeamSerializer(data=request.data)
         if serializer.is_valid():
@@ -145,6 +167,7 @@ class TeamView(APIView):
         return Response(api_response(data=serializer.errors, message="Validation failed", code=400), status=400)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
+    @transaction.atomic
     def put(self, request, team_id):
         try:
             team = Team.objects.get(id=team_id)
@@ -157,23 +180,29 @@ class TeamView(APIView):
             return Response(api_response(message="Team not found", code=404), status=404)
         except Exception:
             logger.exception("Error updating team")
+            # The 500 is a normal response, so roll back explicitly
+            transaction.set_rollback(True)
             return Response(api_response(message="Server error", code=500), status=500)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
+    @transaction.atomic
     def delete(self, request, team_id):
         try:
-            team = Team.objects.get(id=team_id)
+            # captain_id is kept so the captain cache eviction sees it
+            team = Team.objects.only('id', 'captain_id').get(id=team_id)
             team.delete()
             return Response(api_response(message="Team deleted"))
         except Team.DoesNotExist:
             return Response(api_response(message="Team not found", code=404), status=404)
         except Exception:
             logger.exception("Error deleting team")
+            # The 500 is a normal response, so roll back explicitly
+            transaction.set_rollback(True)
             return Response(api_response(message="Server error", code=500), status=500)
 
 class MatchView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = StandardCursorPagination
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
     def get(self, request, match_id=None):
@@ -182,7 +211,7 @@ class MatchView(APIView):
                 match = Match.objects.get(id=match_id)
                 serializer = MatchSerializer(match)
                 return Response(api_response(data=serializer.data))
-            matches = Match.objects.all().order_by('id')
+            matches = Match.objects.all()
             paginator = self.pagination_class()
             result_page = paginator.paginate_queryset(matches, request)
             serializer = MatchSerializer(result_page, many=True)
@@ -194,6 +223,7 @@ class MatchView(APIView):
             return Response(api_response(message="Server error", code=500), status=500)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
+    @transaction.atomic
     def post(self, request):
         serializer = MatchSerializer(data=request.data)
         if serializer.is_valid():
@@ -202,6 +232,7 @@ class MatchView(APIView):
         return Response(api_response(data=serializer.errors, message="Validation failed", code=400), status=400)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
+    @transaction.atomic
     def put(self, request, match_id):
         try:
             match = Match.objects.get(id=match_id)
@@ -214,18 +245,23 @@ class MatchView(APIView):
             return Response(api_response(message="Match not found", code=404), status=404)
         except Exception:
             logger.exception("Error updating match")
+            # The 500 is a normal response, so roll back explicitly
+            transaction.set_rollback(True)
             return Response(api_response(message="Server error", code=500), status=500)
 
     @role_required(RoleEnum.ADMIN, RoleEnum.ORGANISER)
+    @transaction.atomic
     def delete(self, request, match_id):
         try:
-            match = Match.objects.get(id=match_id)
+            match = Match.objects.only('id').get(id=match_id)
             match.delete()
             return Response(api_response(message="Match deleted"))
         except Match.DoesNotExist:
             return Response(api_response(message="Match not found", code=404), status=404)
         except Exception:
             logger.exception("Error deleting match")
+            # The 500 is a normal response, so roll back explicitly
+            transaction.set_rollback(True)
             return Response(api_response(message="Server error", code=500), status=500)
         
         
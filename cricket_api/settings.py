@@ -83,6 +83,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse a connection across requests instead of reconnecting each time,
+        # checking it is still usable before handing it to a new request
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -131,12 +135,19 @@ AUTH_USER_MODEL = 'api.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
 from datetime import timedelta
 
+# Serve the swagger UI at /api/swagger/; off unless debugging
+ENABLE_SWAGGER = DEBUG
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=600),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=10),
@@ -166,12 +177,22 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        # Requests only enqueue records; api.log_queue writes them to file/console
+        'queue': {
+            'class': 'api.log_queue.ProcessQueueHandler',
+            'queue': 'ext://api.log_queue.LOG_QUEUE',
+        },
     },
     'loggers': {
         '': {  # root logger
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'DEBUG',
             'propagate': True,
         },
+        'api.log_sink': {  # drained by the per-process QueueListener in api.log_queue
+            'handlers': ['file', 'console'],
+            'level': 'DEBUG',
+            'propagate': False,
+        },
     },
 }
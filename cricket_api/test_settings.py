@@ -0,0 +1,30 @@
+"""
+Test settings for cricket_api project.
+
+Usage: python manage.py test api --settings=cricket_api.test_settings
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Registration enforces its own minimum length in UserRegisterSerializer, so
+# Django's validators (and the common-passwords file they load) are not needed
+AUTH_PASSWORD_VALIDATORS = []
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Discard request/debug logging so tests never write to logs/debug.log
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'null': {
+            'class': 'logging.NullHandler',
+        },
+    },
+    'root': {
+        'handlers': ['null'],
+        'level': 'WARNING',
+    },
+}